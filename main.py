@@ -1,10 +1,15 @@
 from fastmcp import FastMCP
 import asyncio
+import httpx
 import logging
+import orjson
 import os
-import requests
-from typing import List, Dict, Any, Optional
+import sys
+import time
+from typing import Dict, Any, Optional
 from dotenv import load_dotenv
+from starlette.requests import Request
+from starlette.responses import Response
 
 
 # Load environment variables if any
@@ -13,9 +18,91 @@ load_dotenv()
 # Setup logging
 logger = logging.getLogger("MCP-Server")
 
+# API keys, read once at startup
+_OWM_KEY = os.getenv("OPENWEATHER_API_KEY")
+
 # Create an MCP server
 mcp = FastMCP("MCP")
 
+# Shared HTTP client, reused across tool calls so connections stay pooled and alive.
+# httpx negotiates gzip/br compression by default when brotli is installed.
+_client = httpx.AsyncClient(
+    http2=True,
+    headers={"User-Agent": "MCP-Server/1.0"},
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=300),
+    timeout=httpx.Timeout(connect=2.0, read=5.0, write=5.0, pool=2.0),
+)
+
+# Upstream endpoints, parsed once; query strings are passed via params= so httpx encodes them
+_DDG_URL = httpx.URL("https://api.duckduckgo.com/")
+_OWM_URL = httpx.URL("https://api.openweathermap.org/data/2.5/weather")
+
+# Delays between attempts for transient upstream failures; tool calls are user-facing, so retry once
+_RETRY_DELAYS = (0.2,)
+
+# Overall time budget in seconds for one upstream fetch, including retries
+_DEADLINE = 8.0
+
+# Short-lived cache of tool results: key -> (expiry, task fetching the result)
+_cache: Dict[tuple, tuple[float, asyncio.Task]] = {}
+_CACHE_MAX_ENTRIES = 1024
+
+
+async def _cached(key: tuple, ttl: float, coro_factory) -> Any:
+    """
+    Return the cached result for key, or compute it with coro_factory and cache it for ttl seconds.
+
+    The fetch runs in its own asyncio.Task, which is what the cache stores. Concurrent callers
+    with the same key await that task through asyncio.shield, so a cancelled caller only stops
+    waiting. Failed or cancelled fetches are evicted rather than cached.
+    """
+    now = time.monotonic()
+    entry = _cache.get(key)
+    if entry is None or now >= entry[0]:
+        # Re-insert at the end so dict order stays oldest-first for eviction
+        _cache.pop(key, None)
+        if len(_cache) >= _CACHE_MAX_ENTRIES:
+            for stale in [k for k, (expiry, _) in _cache.items() if expiry <= now]:
+                del _cache[stale]
+            while len(_cache) >= _CACHE_MAX_ENTRIES:
+                del _cache[next(iter(_cache))]
+
+        task = asyncio.create_task(coro_factory())
+        entry = (now + ttl, task)
+        _cache[key] = entry
+
+        def _evict_failed(t: asyncio.Task, entry=entry) -> None:
+            if (t.cancelled() or t.exception() is not None) and _cache.get(key) is entry:
+                del _cache[key]
+
+        task.add_done_callback(_evict_failed)
+
+    return await asyncio.shield(entry[1])
+
+
+async def _get_json(url: httpx.URL, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Fetch url with the shared client and return the decoded JSON body, retrying transient failures."""
+    try:
+        async with asyncio.timeout(_DEADLINE):
+            for delay in _RETRY_DELAYS:
+                try:
+                    response = await _client.get(url, params=params)
+                    if response.status_code < 500:
+                        break
+                except (httpx.ConnectError, httpx.ReadTimeout) as e:
+                    logger.warning("Transient error fetching %s, retrying: %s", url, e)
+                await asyncio.sleep(delay)
+            else:
+                response = await _client.get(url, params=params)
+    except TimeoutError:
+        raise httpx.TimeoutException(f"Deadline of {_DEADLINE}s exceeded fetching {url}") from None
+    response.raise_for_status()
+    try:
+        return orjson.loads(response.content)
+    except ValueError as e:
+        # Keep decode failures (empty or HTML bodies) on the tools' httpx.HTTPError path
+        raise httpx.DecodingError(f"Invalid JSON in response from {url}: {e}", request=response.request) from e
+
 
 # Add MCP Tools here
 
@@ -30,16 +117,14 @@ async def web_search(query: str) -> dict:
     Returns:
         Dictionary containing search results data
     """
-    import requests
-
-    search_url = f"https://api.duckduckgo.com/?q={query}&format=json"
+    key = ("web_search", query.strip().lower())
     try:
-        response = requests.get(search_url)
-        response.raise_for_status()
-        data = response.json()
+        data = await _cached(
+            key, 30, lambda: _get_json(_DDG_URL, {"q": query, "format": "json"})
+        )
         return {"results": data.get("RelatedTopics", [])}
-    except requests.RequestException as e:
-        logger.error(f"Web search error: {str(e)}")
+    except httpx.HTTPError as e:
+        logger.error("Web search error: %s", e)
         return {"error": str(e)}
 
 @mcp.tool()
@@ -53,20 +138,14 @@ async def get_weather(city: str, country: Optional[str] = None) -> dict:
     Returns:
         Comprehensive weather information in a JSON format
     """
-    import requests
-
-    api_key = os.getenv("OPENWEATHER_API_KEY")
-    if not api_key:
-        logger.error("OpenWeather API key not found in environment variables")
+    if not _OWM_KEY:
         return {"error": "API key not configured"}
 
-    location = f"{city},{country}" if country else city
-    weather_url = f"http://api.openweathermap.org/data/2.5/weather?q={location}&appid={api_key}&units=metric"
+    params = {"q": f"{city},{country}" if country else city, "appid": _OWM_KEY, "units": "metric"}
+    key = ("get_weather", city.strip().lower(), (country or "").upper())
 
     try:
-        response = requests.get(weather_url)
-        response.raise_for_status()
-        data = response.json()
+        data = await _cached(key, 600, lambda: _get_json(_OWM_URL, params))
         if data.get("cod") != 200:
             return {"error": data.get("message", "Error fetching weather data")}
         return {
@@ -77,30 +156,58 @@ async def get_weather(city: str, country: Optional[str] = None) -> dict:
             "humidity": data["main"]["humidity"],
             "wind_speed": data["wind"]["speed"]
         }
-    except requests.RequestException as e:
-        logger.error(f"Weather API error: {str(e)}")
+    except httpx.HTTPStatusError as e:
+        # str(e) includes the full request URL, so rebuild the message without the API key
+        error = f"HTTP {e.response.status_code} from {e.request.url.copy_remove_param('appid')}"
+        logger.error("Weather API error: %s", error)
+        return {"error": error}
+    except httpx.HTTPError as e:
+        logger.error("Weather API error: %s", e)
         return {"error": str(e)}
 
 
+# Health check for load balancers and probes; the body is pre-encoded since it never changes
+
+_HEALTH_OK = b'{"status":"OK"}'
+
+
+@mcp.custom_route("/health", methods=["GET"])
+async def health_check(request: Request) -> Response:
+    return Response(content=_HEALTH_OK, media_type="application/json")
+
+
 # Main Function to Start the MCP Server
 
+async def main():
+    if not _OWM_KEY:
+        logger.error("OpenWeather API key not found in environment variables")
+
+    try:
+        await mcp.run_async(
+            transport="streamable-http",
+            host="0.0.0.0",
+            port=8000,
+            uvicorn_config={"http": "httptools"},
+        )
+    finally:
+        await _client.aclose()
+
+
 if __name__ == "__main__":
     
     logger.info("Starting VPN MCP Server")
 
     # This will handle the MCP protocol communication
     try:
-        asyncio.run(
-            mcp.run_async(
-                transport="streamable-http",
-                host="0.0.0.0",
-                port=8000,
-            )
-        )
+        if sys.platform != "win32":
+            import uvloop
+            asyncio.run(main(), loop_factory=uvloop.new_event_loop)
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
         logger.info("Server shutdown requested by user")
     except Exception as e:
-        logger.error(f"Server error: {e}")
+        logger.error("Server error: %s", e)
         raise
     finally:
         logger.info("MCP Server shutdown complete")
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+import main
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    main._cache.clear()
+    yield
+    main._cache.clear()
+
+
+def test_concurrent_callers_share_one_fetch():
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    async def run():
+        return await asyncio.gather(*(main._cached(("k",), 30, fetch) for _ in range(5)))
+
+    assert asyncio.run(run()) == [1] * 5
+    assert calls == 1
+
+
+def test_failed_fetch_is_not_cached():
+    async def fail():
+        raise ValueError("upstream down")
+
+    async def run():
+        with pytest.raises(ValueError):
+            await main._cached(("k",), 30, fail)
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert ("k",) not in main._cache
+
+
+def test_cancelling_first_caller_does_not_cancel_waiters():
+    release = None
+
+    async def fetch():
+        await release.wait()
+        return "result"
+
+    async def run():
+        nonlocal release
+        release = asyncio.Event()
+        first = asyncio.create_task(main._cached(("k",), 30, fetch))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(main._cached(("k",), 30, fetch))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await second == "result"
+        assert first.cancelled()
+
+    asyncio.run(run())
+
+
+def test_cache_evicts_oldest_entries_at_capacity(monkeypatch):
+    monkeypatch.setattr(main, "_CACHE_MAX_ENTRIES", 3)
+
+    async def fetch():
+        return "result"
+
+    async def run():
+        for i in range(5):
+            await main._cached((i,), 30, fetch)
+
+    asyncio.run(run())
+    assert list(main._cache) == [(2,), (3,), (4,)]
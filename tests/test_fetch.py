@@ -0,0 +1,119 @@
+import asyncio
+
+import httpx
+import pytest
+
+import main
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    main._cache.clear()
+    yield
+    main._cache.clear()
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Route the shared client through a MockTransport and record every request made."""
+    requests = []
+
+    def install(handler):
+        async def record(request):
+            requests.append(request)
+            result = handler(request)
+            return await result if asyncio.iscoroutine(result) else result
+
+        monkeypatch.setattr(main, "_client", httpx.AsyncClient(transport=httpx.MockTransport(record)))
+        return requests
+
+    return install
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        httpx.Response(202, content=b""),
+        httpx.Response(200, content=b"<html>Service unavailable</html>", headers={"Content-Type": "text/html"}),
+    ],
+    ids=["empty-202", "html-200"],
+)
+def test_web_search_reports_non_json_body_as_error(upstream, response):
+    upstream(lambda request: response)
+
+    result = asyncio.run(main.web_search("python"))
+
+    assert "error" in result
+    assert ("web_search", "python") not in main._cache
+
+
+@pytest.fixture
+def no_retry_delay(monkeypatch):
+    monkeypatch.setattr(main, "_RETRY_DELAYS", (0,))
+
+
+def test_5xx_is_retried_once(upstream, no_retry_delay):
+    responses = iter([httpx.Response(503), httpx.Response(200, json={"ok": True})])
+    requests = upstream(lambda request: next(responses))
+
+    assert asyncio.run(main._get_json(main._DDG_URL, {})) == {"ok": True}
+    assert len(requests) == 2
+
+
+@pytest.mark.parametrize("error", [httpx.ConnectError, httpx.ReadTimeout])
+def test_transient_error_is_retried_once(upstream, no_retry_delay, error):
+    def handler(request):
+        if len(requests) == 1:
+            raise error("transient", request=request)
+        return httpx.Response(200, json={"ok": True})
+
+    requests = upstream(handler)
+
+    assert asyncio.run(main._get_json(main._DDG_URL, {})) == {"ok": True}
+    assert len(requests) == 2
+
+
+def test_failure_on_second_attempt_propagates(upstream, no_retry_delay):
+    def handler(request):
+        raise httpx.ConnectError("down", request=request)
+
+    requests = upstream(handler)
+
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(main._get_json(main._DDG_URL, {}))
+    assert len(requests) == 2
+
+
+def test_4xx_is_not_retried(upstream, no_retry_delay):
+    requests = upstream(lambda request: httpx.Response(404))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(main._get_json(main._DDG_URL, {}))
+    assert len(requests) == 1
+
+
+def test_deadline_returns_error_and_evicts_entry(upstream, monkeypatch):
+    monkeypatch.setattr(main, "_DEADLINE", 0.05)
+
+    async def slow(request):
+        await asyncio.sleep(1)
+        return httpx.Response(200, json={})
+
+    upstream(slow)
+
+    result = asyncio.run(main.web_search("python"))
+
+    assert "Deadline" in result["error"]
+    assert ("web_search", "python") not in main._cache
+
+
+def test_get_weather_error_does_not_leak_api_key(upstream, monkeypatch, caplog):
+    monkeypatch.setattr(main, "_OWM_KEY", "secret-key")
+    requests = upstream(lambda request: httpx.Response(404))
+
+    result = asyncio.run(main.get_weather("Nowhere"))
+
+    assert "secret-key" in str(requests[0].url)
+    assert "404" in result["error"]
+    assert "secret-key" not in result["error"]
+    assert "secret-key" not in caplog.text